@@ -6,21 +6,27 @@
 
 # Type annotations
 from __future__ import annotations
-from typing import Final
+from typing import Final, BinaryIO, Dict, Iterator, Tuple
 
 # Standard libs
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # External libs
 from cmdkit.app import Application
 from cmdkit.cli import Interface
-from polars import DataFrame
 from tqdm import tqdm
-from numpy.random import default_rng
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from numpy.random import Generator, SeedSequence, SFC64
 
 # Internal libs
 from onetrc.data import STATION_DATA
+from onetrc import fastcsv
 from onetrc.config import cfg, log, set_verbose
 
 # Public interface
@@ -52,6 +58,46 @@ Options:
 DEFAULT_SAMPLES: Final[int] = int(cfg.build.samples)
 DEFAULT_FILES: Final[int] = int(cfg.build.files)
 DEFAULT_STDEV: Final[float] = float(cfg.build.stdev)
+DEFAULT_DTYPE: Final[np.dtype] = np.dtype(cfg.build.dtype)  # float32 or float64
+DEFAULT_CHUNKSIZE: Final[int] = int(cfg.build.chunksize)
+DEFAULT_ROWGROUPSIZE: Final[int] = int(cfg.build.rowgroupsize)
+
+# Rows generated per batch by output format (row groups never span batches, so
+# Parquet batches must be at least as large as a row group for `rowgroupsize` to apply)
+BATCH_SIZE: Final[Dict[str, int]] = {
+    'csv': DEFAULT_CHUNKSIZE,
+    'parquet': max(DEFAULT_CHUNKSIZE, DEFAULT_ROWGROUPSIZE),
+}
+
+
+# Station data as arrays, computed once per process at import time
+STATION_NAMES: Final[pa.StringArray] = pa.array([name for name, _ in STATION_DATA], type=pa.string())
+STATION_MEANS: Final[np.ndarray] = np.array([mean for _, mean in STATION_DATA], dtype=DEFAULT_DTYPE)
+
+# Temperatures are stored as int16 tenths of a degree, saturated at +/- 3276.7
+TENTHS_LIMIT: Final[int] = int(np.iinfo(np.int16).max)
+
+# Every clipped tenths value pre-formatted as text (TENTHS_TEXT[t + TENTHS_LIMIT] is `t` tenths)
+TENTHS_TEXT: Final[pa.StringArray] = pa.array([
+    f'{"-" if t < 0 else ""}{abs(t) // 10}.{abs(t) % 10}' for t in range(-TENTHS_LIMIT, TENTHS_LIMIT + 1)
+], type=pa.string())
+
+# Upper bound on bytes per CSV line (clipped tenths never exceed ';-3276.7\n')
+CSV_MAX_LINE: Final[int] = max(len(name.encode()) for name, _ in STATION_DATA) + len(';-3276.7\n')
+
+
+# Plain `name;temp` lines (station names never need quoting)
+CSV_OPTIONS: Final[pa_csv.WriteOptions] = pa_csv.WriteOptions(
+    include_header=False, delimiter=';', quoting_style='none'
+)
+CSV_SCHEMA: Final[pa.Schema] = pa.schema([
+    ('station_name', pa.string()),
+    ('temperature', pa.string()),
+])
+PARQUET_SCHEMA: Final[pa.Schema] = pa.schema([
+    ('station_name', pa.string()),
+    ('temperature', pa.from_numpy_dtype(DEFAULT_DTYPE)),
+])
 
 
 class BuildMeasurements(Application):
@@ -85,29 +131,46 @@ class BuildMeasurements(Application):
         """Run program."""
         if self.verbose_mode:
             set_verbose()
-        rng = default_rng()
-        data = DataFrame(STATION_DATA, ("station_name", "temperature"), orient="row")
-        stream = sys.stdout if self.stream_output else None
+        if self.stream_output:
+            self.write_stream()
+        else:
+            self.write_files()
+
+    def write_stream(self: BuildMeasurements) -> None:
+        """Write all batches in sequence to <stdout>."""
+        rng = Generator(SFC64())
         with self.progress_bar() as progress:
-            for i in range(self.num_files):
-                batch = data.sample(n=self.num_samples, with_replacement=True)
-                batch = batch.with_columns(temperature=rng.normal(batch["temperature"], DEFAULT_STDEV))
-                filepath = '<stdout>' if self.stream_output else self.build_filepath(i)
-                log.info(f'Writing data ({self.num_samples}) to file ({filepath})')
-                progress.set_description(os.path.basename(filepath))
-                match self.output_format:
-                    case 'csv':
-                        batch.write_csv(stream or filepath, separator=';', float_precision=1, include_header=False)
-                    case 'parquet':
-                        batch.write_parquet(stream or filepath)
+            progress.set_description('<stdout>')
+            for _ in range(self.num_files):
+                log.info(f'Writing data ({self.num_samples}) to file (<stdout>)')
+                batches = iter_batches(rng, self.num_samples, DEFAULT_STDEV, BATCH_SIZE[self.output_format])
+                write_batches(batches, sys.stdout.buffer, self.output_format)
                 progress.update(self.num_samples)
 
-    def build_filepath(self: BuildMeasurements, i: int) -> str:
-        """Left-pad file number."""
-        return os.path.join(
-            self.output_dir,
-            'measurements-' + str(i).zfill(len(str(self.num_files))) + f'.{self.output_format}'
-        )
+    def write_files(self: BuildMeasurements) -> None:
+        """Write each batch to its own file in parallel."""
+        if self.num_files < 1:
+            return
+        num_cpus = os.cpu_count() or 1
+        max_workers = min(self.num_files, num_cpus)
+        seeds = SeedSequence().spawn(self.num_files)
+        width = len(str(self.num_files))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=fastcsv.set_threads,
+                                 initargs=(num_cpus // max_workers, )) as executor:
+            futures = []
+            for i, seed in enumerate(seeds):
+                filepath = self.build_filepath(i, width)
+                log.info(f'Writing data ({self.num_samples}) to file ({filepath})')
+                futures.append(executor.submit(build_file, seed, self.num_samples, DEFAULT_STDEV,
+                                               filepath, self.output_format))
+            with self.progress_bar() as progress:
+                for future in as_completed(futures):
+                    progress.set_description(os.path.basename(future.result()))
+                    progress.update(self.num_samples)
+
+    def build_filepath(self: BuildMeasurements, i: int, width: int) -> str:
+        """Left-pad file number to `width` digits."""
+        return os.path.join(self.output_dir, f'measurements-{i:0{width}d}.{self.output_format}')
 
     def progress_bar(self: BuildMeasurements) -> tqdm:
         """Build progress bar interface."""
@@ -116,5 +179,88 @@ class BuildMeasurements(Application):
             unit='row',
             unit_scale=True,
             ascii=True,
-            file=(sys.stderr if self.progress_mode else open(os.devnull, 'w')),
-        )
\ No newline at end of file
+            file=sys.stderr,
+            disable=(not self.progress_mode),
+        )
+
+
+def build_batch(rng: Generator, num_samples: int, stdev: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample `num_samples` station indices and temperatures (in tenths of a degree)."""
+    idx = rng.integers(0, len(STATION_MEANS), size=num_samples, dtype=np.int32)
+    temps = rng.standard_normal(num_samples, dtype=DEFAULT_DTYPE)
+    temps *= stdev
+    temps += STATION_MEANS[idx]
+    temps *= 10
+    np.rint(temps, out=temps)
+    # Clip before narrowing so extreme draws (e.g., a large stdev) saturate instead of wrapping
+    np.clip(temps, -TENTHS_LIMIT, TENTHS_LIMIT, out=temps)
+    return idx, temps.astype(np.int16)
+
+
+def iter_batches(rng: Generator, num_samples: int, stdev: float,
+                 chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Generate `num_samples` measurements in batches of at most `chunksize` rows."""
+    for start in range(0, num_samples, chunksize):
+        yield build_batch(rng, min(chunksize, num_samples - start), stdev)
+
+
+def write_batches(batches: Iterator[Tuple[np.ndarray, np.ndarray]],
+                  target: str | BinaryIO | pa.NativeFile, output_format: str) -> None:
+    """Write each batch of station `idx` and `tenths` to `target` in `output_format`."""
+    match output_format:
+        case 'csv' if fastcsv.HAVE_NUMBA:
+            for idx, tenths in batches:
+                target.write(fastcsv.format_csv(idx, tenths))
+        case 'csv':
+            with pa_csv.CSVWriter(target, CSV_SCHEMA, write_options=CSV_OPTIONS) as writer:
+                for idx, tenths in batches:
+                    writer.write_batch(build_csv_batch(idx, tenths))
+        case 'parquet':
+            # Each batch is split into row groups of `rowgroupsize` rows (see BATCH_SIZE);
+            # many row groups lets READ_PARQUET scan in parallel
+            with pq.ParquetWriter(target, PARQUET_SCHEMA, compression='snappy', write_statistics=True) as writer:
+                for idx, tenths in batches:
+                    writer.write_batch(build_parquet_batch(idx, tenths), row_group_size=DEFAULT_ROWGROUPSIZE)
+
+
+def build_csv_batch(idx: np.ndarray, tenths: np.ndarray) -> pa.RecordBatch:
+    """Build record batch of station names and formatted temperatures for CSV output."""
+    return pa.record_batch([pc.take(STATION_NAMES, idx), format_tenths(tenths)], schema=CSV_SCHEMA)
+
+
+def build_parquet_batch(idx: np.ndarray, tenths: np.ndarray) -> pa.RecordBatch:
+    """Build record batch of station names and temperatures for Parquet output."""
+    temps = np.divide(tenths, 10, dtype=DEFAULT_DTYPE)
+    return pa.record_batch([pc.take(STATION_NAMES, idx), pa.array(temps)], schema=PARQUET_SCHEMA)
+
+
+def format_tenths(tenths: np.ndarray) -> pa.StringArray:
+    """Format integer tenths of a degree as decimal text with exactly one fractional digit."""
+    return pc.take(TENTHS_TEXT, tenths.astype(np.int32) + TENTHS_LIMIT)
+
+
+def write_csv_file(batches: Iterator[Tuple[np.ndarray, np.ndarray]], filepath: str, capacity: int) -> None:
+    """Fill a memory-mapped file sized to `capacity` bytes then trim to what was written."""
+    if fastcsv.HAVE_NUMBA:
+        # Compiled formatter writes lines directly into the mapped pages
+        buffer = np.memmap(filepath, dtype=np.uint8, mode='w+', shape=(max(1, capacity), ))
+        size = 0
+        for idx, tenths in batches:
+            size += len(fastcsv.format_csv(idx, tenths, out=buffer[size:]))
+        del buffer
+    else:
+        with pa.create_memory_map(filepath, capacity) as sink:
+            write_batches(batches, sink, 'csv')
+            size = sink.tell()
+    os.truncate(filepath, size)
+
+
+def build_file(seed: SeedSequence, num_samples: int, stdev: float, filepath: str, output_format: str) -> str:
+    """Build and write a batch of measurements to `filepath` (runs in worker process)."""
+    rng = Generator(SFC64(seed))
+    batches = iter_batches(rng, num_samples, stdev, BATCH_SIZE[output_format])
+    if output_format == 'csv':
+        write_csv_file(batches, filepath, num_samples * CSV_MAX_LINE)
+    else:
+        write_batches(batches, filepath, output_format)
+    return filepath
@@ -42,6 +42,9 @@ cfg = Configuration.from_local(env=True, prefix=PKGNAME.upper(), default={
         'samples': 10_000_000,
         'files': 1,
         'stdev': 10,
+        'dtype': 'float32',
+        'chunksize': 1_000_000,
+        'rowgroupsize': 1_000_000,
     },
 })
 
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2025 Geoffrey Lentner
+# SPDX-License-Identifier: MIT
+
+"""
+Compiled CSV row formatter for measurement data.
+
+Formats `name;temp` lines straight from station indices and int16 tenths of a degree
+into a flat byte buffer using numba. This is optional; if numba is not installed
+`HAVE_NUMBA` is False and callers should fall back to the Arrow-based writer.
+"""
+
+
+# Type annotations
+from __future__ import annotations
+from typing import Final, List, Callable
+
+# External libs
+import numpy as np
+
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:
+    njit = None
+    prange = range
+
+# Internal libs
+from onetrc.data import STATION_DATA
+
+# Public interface
+__all__ = ['HAVE_NUMBA', 'format_csv', 'set_threads', ]
+
+
+HAVE_NUMBA: Final[bool] = njit is not None
+
+
+# Station names as one flat UTF-8 buffer with offsets (name k is NAME_BUFFER[NAME_OFFSETS[k]:NAME_OFFSETS[k+1]])
+NAME_BYTES: Final[List[bytes]] = [name.encode() for name, _ in STATION_DATA]
+NAME_BUFFER: Final[np.ndarray] = np.frombuffer(b''.join(NAME_BYTES), dtype=np.uint8)
+NAME_OFFSETS: Final[np.ndarray] = np.cumsum([0, *map(len, NAME_BYTES)], dtype=np.int64)
+
+
+def jit(func: Callable) -> Callable:
+    """Compile `func` with numba if available."""
+    return njit(parallel=True, boundscheck=False, cache=True)(func) if HAVE_NUMBA else func
+
+
+@jit
+def line_lengths(idx: np.ndarray, tenths: np.ndarray, name_offsets: np.ndarray, out: np.ndarray) -> None:
+    """Compute byte length of each formatted line into `out`."""
+    for i in prange(len(idx)):
+        value = abs(np.int32(tenths[i]))
+        whole = value // 10
+        digits = 1
+        while whole >= 10:
+            whole //= 10
+            digits += 1
+        name_length = name_offsets[idx[i] + 1] - name_offsets[idx[i]]
+        # name ; [-] digits . digit \n
+        out[i] = name_length + 1 + (tenths[i] < 0) + digits + 3
+
+
+@jit
+def format_rows(idx: np.ndarray, tenths: np.ndarray, name_offsets: np.ndarray, name_buffer: np.ndarray,
+                line_offsets: np.ndarray, out: np.ndarray) -> None:
+    """Write each formatted line into `out` starting at its line offset."""
+    for i in prange(len(idx)):
+        pos = line_offsets[i]
+        for j in range(name_offsets[idx[i]], name_offsets[idx[i] + 1]):
+            out[pos] = name_buffer[j]
+            pos += 1
+        out[pos] = 59  # ';'
+        pos += 1
+        value = np.int32(tenths[i])
+        if value < 0:
+            out[pos] = 45  # '-'
+            pos += 1
+            value = -value
+        whole = value // 10
+        digits = 1
+        scan = whole
+        while scan >= 10:
+            scan //= 10
+            digits += 1
+        for d in range(digits):
+            out[pos + digits - 1 - d] = 48 + whole % 10
+            whole //= 10
+        pos += digits
+        out[pos] = 46  # '.'
+        out[pos + 1] = 48 + value % 10
+        out[pos + 2] = 10  # '\n'
+
+
+def format_csv(idx: np.ndarray, tenths: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Format `name;temp` lines for station `idx` and `tenths` of a degree.
+
+    Lines are written to the start of `out` (a uint8 buffer), allocated if not given.
+    Returns the filled slice of `out`.
+    """
+    line_offsets = np.zeros(len(idx) + 1, dtype=np.int64)
+    line_lengths(idx, tenths, NAME_OFFSETS, line_offsets[1:])
+    np.cumsum(line_offsets, out=line_offsets)
+    size = int(line_offsets[-1])
+    if out is None:
+        out = np.empty(size, dtype=np.uint8)
+    elif len(out) < size:
+        raise ValueError(f'Output buffer too small ({len(out)} < {size} bytes)')
+    format_rows(idx, tenths, NAME_OFFSETS, NAME_BUFFER, line_offsets, out)
+    return out[:size]
+
+
+def set_threads(count: int) -> None:
+    """Limit numba threads used by this process (e.g., per worker in a process pool)."""
+    if HAVE_NUMBA:
+        set_num_threads(max(1, count))
@@ -6,14 +6,18 @@
 
 # Type annotations
 from __future__ import annotations
-from typing import List, Final, Dict, IO, Callable, Optional
+from typing import List, Final, Dict, IO, Callable, Optional, Any
 
 # Standard libs
 import sys
+from functools import lru_cache
 
 # External libs
 from cmdkit.cli import Interface
 import duckdb
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Internal libs
 from onetrc.solutions.interface import Solution
@@ -80,6 +84,7 @@ class DuckdbBasic(Solution):
 
     print_format: str = 'normal'
     print_formats: List[str] = ['normal', 'csv', 'json', 'parquet']
+    binary_formats: List[str] = ['json', 'parquet']
     print_interface = interface.add_mutually_exclusive_group()
     print_interface.add_argument('-f', '--format', dest='print_format', default=print_format, choices=print_formats)
     print_interface.add_argument('--csv', action='store_const', dest='print_format', const='csv')
@@ -104,16 +109,21 @@ class DuckdbBasic(Solution):
             sql = SQL_PART_CSV if not self.parquet_mode else SQL_PART_PARQUET
         else:
             sql = SQL_MERGE_CSV if not self.parquet_mode else SQL_MERGE_PARQUET
-        query = run_query(self.filepattern, sql, pragmas=self.pragmas, settings=self.settings)
+        pragmas = format_pragmas(self.pragmas)
+        settings = format_settings(self.settings)
+        query = run_query(self.filepattern, sql, pragmas=pragmas, settings=settings)
+        if not self.merge_mode:
+            query = query.order('station_name')
         self.print_output(query)
 
     def print_output(self: DuckdbBasic, query: duckdb.DuckDBPyRelation) -> None:
         """Print query results."""
         formatter = PRINT_MODE[self.print_format]
+        binary = self.print_format in self.binary_formats
         if self.output_filename == '-':
-            formatter(query, stream=sys.stdout)
+            formatter(query, stream=(sys.stdout.buffer if binary else sys.stdout))
         else:
-            mode = 'wb' if self.print_format == 'parquet' else 'w'
+            mode = 'wb' if binary else 'w'
             with open(self.output_filename, mode=mode) as stream:
                 formatter(query, stream=stream)
 
@@ -129,8 +139,7 @@ SELECT
     MAX(temperature) AS temp_max,
     CAST(AVG(temperature) AS DECIMAL(8,1)) AS temp_mean
 FROM READ_CSV('{filepattern}', header=false, columns={{'station_name':'TEXT','temperature':'double'}}, delim=';')
-GROUP BY station_name
-ORDER BY station_name;
+GROUP BY station_name;
 """
 
 
@@ -141,12 +150,11 @@ SQL_PART_PARQUET: Final[str] = """
 SELECT
     station_name,
     COUNT(temperature) AS station_count,
-    MIN(temperature) AS temp_min,
-    MAX(temperature) AS temp_max,
+    CAST(MIN(temperature) AS DECIMAL(8,1)) AS temp_min,
+    CAST(MAX(temperature) AS DECIMAL(8,1)) AS temp_max,
     CAST(AVG(temperature) AS DECIMAL(8,1)) AS temp_mean
 FROM READ_PARQUET('{filepattern}')
-GROUP BY station_name
-ORDER BY station_name;
+GROUP BY station_name;
 """
 
 
@@ -185,25 +193,35 @@ ORDER BY station_name;
 def run_query(
         filepattern: str,
         query: str = SQL_PART_CSV,
-        pragmas: List[str] | None = None,
-        settings: List[str] | None = None) -> duckdb.DuckDBPyRelation:
-    """Execute SQL query against target filepattern."""
-    return duckdb.query(
-        query.format(
-            filepattern=filepattern,
-            pragmas='\n'.join([f'PRAGMA {value};' for value in (pragmas or [])]),
-            settings='\n'.join([f'SET {key} = {smart_format_value(value)};'
-                                for key, value in parse_settings_args(settings).items()]),
-        )
-    )
+        pragmas: str = '',
+        settings: str = '') -> duckdb.DuckDBPyRelation:
+    """Execute SQL query against target filepattern with pre-formatted pragmas and settings."""
+    return duckdb.query(build_query(filepattern, query, pragmas, settings))
+
+
+@lru_cache(maxsize=32)
+def build_query(filepattern: str, query: str, pragmas: str, settings: str) -> str:
+    """Format SQL query template (cached since all arguments are plain strings)."""
+    return query.format(filepattern=filepattern, pragmas=pragmas, settings=settings)
+
+
+def format_pragmas(pragmas: List[str] | None) -> str:
+    """Format PRAGMA statements for query prelude."""
+    return '\n'.join([f'PRAGMA {value};' for value in (pragmas or [])])
+
+
+def format_settings(settings: List[str] | None) -> str:
+    """Format SET statements for query prelude."""
+    return '\n'.join([f'SET {key} = {smart_format_value(value)};'
+                      for key, value in parse_settings_args(settings).items()])
 
 
 def smart_format_value(value: str) -> str:
     """Apply single-quotes if text value."""
-    try:
-        return str(int(value))
-    except ValueError:
-        return f"'{value}'"
+    digits = value.removeprefix('-')
+    if digits.isascii() and digits.isdigit():
+        return value
+    return f"'{value}'"
 
 
 def parse_settings_args(settings: List[str] | None) -> Dict[str, str]:
@@ -216,23 +234,32 @@ def parse_settings_args(settings: List[str] | None) -> Dict[str, str]:
 
 
 def print_normal(query: duckdb.DuckDBPyRelation, stream: IO = sys.stdout) -> None:
-    """Print query results in normal format."""
-    print(query.df().to_string(index=False, float_format='%.1f'), file=stream)
+    """Print query results in normal format (right-aligned columns, one decimal place)."""
+    data = pa.table(query.arrow()).to_pydict()
+    columns = [[name, *map(format_cell, values)] for name, values in data.items()]
+    widths = [max(map(len, column)) for column in columns]
+    for row in zip(*columns):
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)), file=stream)
+
+
+def format_cell(value: Any) -> str:
+    """Format single value for normal output."""
+    return str(value) if isinstance(value, (str, int)) else f'{value:.1f}'
 
 
 def print_csv(query: duckdb.DuckDBPyRelation, stream: IO = sys.stdout) -> None:
     """Print query results in CSV format."""
-    query.df().to_csv(path_or_buf=stream, index=False, sep=',', float_format='%.1f')
+    query.pl().write_csv(stream, separator=',', float_precision=1)
 
 
-def print_json(query: duckdb.DuckDBPyRelation, stream: IO = sys.stdout) -> None:
+def print_json(query: duckdb.DuckDBPyRelation, stream: IO = sys.stdout.buffer) -> None:
     """Print query results in JSON format."""
-    query.df().to_json(path_or_buf=stream, orient='records', double_precision=1, force_ascii=False)
+    stream.write(orjson.dumps(pa.table(query.arrow()).to_pylist(), default=float))
 
 
 def print_parquet(query: duckdb.DuckDBPyRelation, stream: IO = sys.stdout) -> None:
     """Print query results in Parquet format."""
-    query.df().to_parquet(stream)
+    pq.write_table(pa.table(query.arrow()), stream)
 
 
 PRINT_MODE: Dict[str, Callable[[duckdb.DuckDBPyRelation, Optional[IO]], None]] = {